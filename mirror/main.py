@@ -2,25 +2,187 @@
 
 import os
 import sys
+import errno
+import json
+import hashlib
+import platform
+import functools
 import yaml
 import subprocess
 import time
+import random
 import gzip
 import shutil
 import tempfile
+import threading
+import asyncio
+import contextvars
 import requests
-from typing import Dict, List, Any, Callable, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, ExitStack
+from typing import Dict, List, Set, Any, Callable, Optional, BinaryIO, Tuple, NamedTuple
 from pathlib import Path
 
+try:
+    # libyaml's C parser is much faster than the pure-Python one
+    from yaml import CSafeLoader as ConfigLoader
+except ImportError:
+    from yaml import SafeLoader as ConfigLoader
+
+try:
+    # ISA-L decompresses gzip roughly twice as fast as zlib
+    from isal import igzip as fast_gzip
+except ImportError:
+    fast_gzip = gzip
+
+try:
+    # Decompresses large gzip files in parallel chunks
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+
+# Read buffer for compressed input files
+READ_BUFFER_SIZE = 128 * 1024
+
+# Block size for bulk copies (downloads, decompression output), to keep syscalls per MB low
+COPY_BUFSIZE = 1024 * 1024
+
+# Gzip inputs above this size are decompressed in parallel when rapidgzip is available;
+# below it, starting the decoder threads costs more than it saves
+PARALLEL_GUNZIP_THRESHOLD = 64 * 1024 * 1024
+PARALLEL_GUNZIP_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Files above this size are downloaded over several connections when the server supports ranges
+RANGED_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024
+RANGED_DOWNLOAD_SEGMENTS = 8
+
+# Memory-backed filesystem for downloads that fit in RAM
+TMPFS_DIR = "/dev/shm"
+
+# tmpfs space needed per downloaded byte: the download plus its decompressed output
+TMPFS_SPACE_FACTOR = 4
+
+# Upper bound for the delay between retry attempts, in seconds
+MAX_RETRY_DELAY = 60
+
+# Connect and read timeouts for HTTP requests, in seconds
+HTTP_TIMEOUT = (5, 60)
+
+# Retries of a single HTTP request on transient errors. Kept small, as mirror_file retries
+# the whole fetch on top of this
+HTTP_RETRIES = 2
+
+# Shared HTTP session, so downloads reuse connections (see configure_http_session)
+_session = requests.Session()
+
+# Output of parallel jobs is buffered per worker thread or asyncio task and printed as one block
+_print_lock = threading.Lock()
+_output_buffer: "contextvars.ContextVar[Optional[List[str]]]" = contextvars.ContextVar("output_buffer", default=None)
+
+
+def log(message: str = "") -> None:
+    """Print a message, or buffer it if the current job collects its output."""
+    buffer = _output_buffer.get()
+    if buffer is None:
+        print(message)
+    else:
+        buffer.append(message)
+
+
+@contextmanager
+def buffered_output():
+    """Collect output of the current job and print it atomically on exit, or add it to the enclosing job's output."""
+    lines: List[str] = []
+    token = _output_buffer.set(lines)
+    try:
+        yield
+    finally:
+        _output_buffer.reset(token)
+        if lines:
+            parent = _output_buffer.get()
+            if parent is not None:
+                parent.extend(lines)
+            else:
+                with _print_lock:
+                    print("\n".join(lines) + "\n", flush=True)
+
+
+def retry_backoff(retry_delay: float, attempt: int) -> float:
+    """Delay before the next attempt: doubles per attempt, plus random jitter."""
+    return min(retry_delay * 2 ** (attempt - 1) + random.uniform(0, retry_delay), MAX_RETRY_DELAY)
+
+
+def run_command(cmd: List[str]) -> int:
+    """Run a command, sending its combined output to stdout or the current job's buffer."""
+    buffer = _output_buffer.get()
+    if buffer is None:
+        # The child writes straight to our stdout, no need to relay it line by line
+        sys.stdout.flush()
+        return subprocess.run(cmd, stdin=subprocess.DEVNULL, stderr=subprocess.STDOUT).returncode
+    
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = result.stdout.decode(errors="replace").rstrip()
+    if output:
+        buffer.append(output)
+    return result.returncode
+
+
+async def run_command_async(cmd: List[str]) -> int:
+    """Run a command from the event loop, sending its combined output to stdout or the current job's buffer."""
+    buffer = _output_buffer.get()
+    if buffer is None:
+        sys.stdout.flush()
+        process = await asyncio.create_subprocess_exec(*cmd, stdin=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.STDOUT)
+        return await process.wait()
+    
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT
+    )
+    stdout, _ = await process.communicate()
+    output = stdout.decode(errors="replace").rstrip()
+    if output:
+        buffer.append(output)
+    return process.returncode
+
+
+async def run_capture_async(cmd: List[str]) -> Tuple[int, bytes]:
+    """Run a command from the event loop and return its exit code and stdout."""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    stdout, _ = await process.communicate()
+    return process.returncode, stdout
+
+
+def run_buffered(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a mirror job with buffered output, for use in a worker pool."""
+    with buffered_output():
+        return func(*args)
+
 
 def load_config(config_file: str) -> Dict[str, Any]:
     """Load and parse the YAML configuration file."""
     with open(config_file, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=ConfigLoader)
 
 
+@functools.lru_cache(maxsize=None)
 def check_tool_availability(tool: str) -> bool:
     """Check if a command-line tool is available."""
+    # Tools that are not on PATH don't need to be executed at all
+    if shutil.which(tool) is None:
+        return False
+    
     # Different tools use different version flags
     version_flags = {
         "skopeo": ["--version"],
@@ -32,8 +194,8 @@ def check_tool_availability(tool: str) -> bool:
     try:
         result = subprocess.run(
             [tool] + flags,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=5
         )
         return result.returncode == 0
@@ -53,6 +215,12 @@ def verify_required_tools(tools: List[str]) -> None:
         sys.exit(1)
 
 
+def advise_sequential(fd: int) -> None:
+    """Tell the kernel a file will be accessed sequentially, where posix_fadvise exists."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
 # Transformer registry
 TRANSFORMERS: Dict[str, Callable[[Path], Path]] = {}
 
@@ -70,95 +238,627 @@ def gunzip_transformer(input_path: Path) -> Path:
     """Decompress a gzip file."""
     output_path = input_path.with_suffix("")
     
-    with gzip.open(input_path, 'rb') as f_in:
-        with open(output_path, 'wb') as f_out:
-            shutil.copyfileobj(f_in, f_out)
+    if rapidgzip is not None and input_path.stat().st_size > PARALLEL_GUNZIP_THRESHOLD:
+        with rapidgzip.RapidgzipFile(
+            str(input_path),
+            parallelization=os.cpu_count() or 1,
+            chunk_size=PARALLEL_GUNZIP_CHUNK_SIZE
+        ) as f_in:
+            with open(output_path, 'wb') as f_out:
+                advise_sequential(f_out.fileno())
+                shutil.copyfileobj(f_in, f_out, COPY_BUFSIZE)
+    else:
+        with open(input_path, 'rb', buffering=READ_BUFFER_SIZE) as raw_in:
+            advise_sequential(raw_in.fileno())
+            with fast_gzip.GzipFile(fileobj=raw_in, mode='rb') as f_in:
+                with open(output_path, 'wb') as f_out:
+                    advise_sequential(f_out.fileno())
+                    shutil.copyfileobj(f_in, f_out, COPY_BUFSIZE)
     
     return output_path
 
 
-def mirror_image(source: str, destination: str, tag: str, registry_owner: str, registry_username: str, registry_password: str, retry_attempts: int, retry_delay: int) -> bool:
-    """Mirror a single Docker image using skopeo."""
-    # Replace template variables
-    destination = destination.replace("{{GITHUB_REPOSITORY_OWNER}}", registry_owner)
+# Streaming transformer registry: each wraps a binary stream and maps the output file name
+StreamTransformer = Callable[[BinaryIO, Path], Tuple[BinaryIO, Path]]
+STREAM_TRANSFORMERS: Dict[str, StreamTransformer] = {}
+
+
+def register_stream_transformer(name: str):
+    """Decorator to register a streaming variant of a transformer."""
+    def decorator(func: StreamTransformer):
+        STREAM_TRANSFORMERS[name] = func
+        return func
+    return decorator
+
+
+@register_stream_transformer("gunzip")
+def gunzip_stream_transformer(stream: BinaryIO, path: Path) -> Tuple[BinaryIO, Path]:
+    """Decompress a gzip stream on the fly."""
+    return fast_gzip.GzipFile(fileobj=stream, mode='rb'), path.with_suffix("")
+
+
+class CompiledTransforms(NamedTuple):
+    """A transform chain resolved to callables once, ahead of any download."""
+    # Canonical form of the chain, identifying its output
+    key: str
+    # Transformer names, in order
+    names: List[str]
+    # Leading steps with streaming variants, fused into the download
+    stream: List[Tuple[str, StreamTransformer]]
+    # Remaining steps, applied to the downloaded file
+    apply: Callable[[Path], Path]
+    # Every step, applied to the downloaded file when it isn't streamed
+    apply_all: Callable[[Path], Path]
+
+
+def apply_transforms(file_path: Path, transformers: List[Tuple[str, Callable[[Path], Path]]]) -> Path:
+    """Apply a list of resolved transformers to a file."""
+    current_path = file_path
+    
+    for name, transformer in transformers:
+        log(f"Applying transform: {name}")
+        output_path = transformer(current_path)
+        
+        # The input is not needed anymore; on tmpfs it would keep holding memory
+        if output_path != current_path:
+            current_path.unlink()
+        current_path = output_path
     
+    return current_path
+
+
+def compile_transforms(transforms: List[Dict[str, Any]]) -> CompiledTransforms:
+    """Validate a list of transforms and resolve it into a pipeline."""
+    if not isinstance(transforms, list):
+        raise ValueError("'transforms' must be a list")
+    
+    names = []
+    for transform in transforms:
+        if not isinstance(transform, dict):
+            raise ValueError(f"Transform must be a mapping with a 'type', got: {transform!r}")
+        transform_type = transform.get("type")
+        
+        if transform_type not in TRANSFORMERS:
+            raise ValueError(f"Unknown transformer type: {transform_type}")
+        
+        names.append(transform_type)
+    
+    # Adjacent streaming steps at the start run in one pass while downloading
+    fused = 0
+    while fused < len(names) and names[fused] in STREAM_TRANSFORMERS:
+        fused += 1
+    
+    # Transform order changes the output, so only the keys inside each transform are sorted.
+    # YAML values JSON lacks, like dates, are keyed by their string form
+    return CompiledTransforms(
+        key=json.dumps(transforms, sort_keys=True, default=str),
+        names=names,
+        stream=[(name, STREAM_TRANSFORMERS[name]) for name in names[:fused]],
+        apply=functools.partial(apply_transforms, transformers=[(name, TRANSFORMERS[name]) for name in names[fused:]]),
+        apply_all=functools.partial(apply_transforms, transformers=[(name, TRANSFORMERS[name]) for name in names])
+    )
+
+
+# Manifest media types that list per-platform images
+MANIFEST_LIST_TYPES = {
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.index.v1+json",
+}
+
+# platform.machine() values that differ from the OCI architecture names
+OCI_ARCHITECTURES = {
+    "x86_64": "amd64",
+    "aarch64": "arm64",
+    "armv7l": "arm",
+}
+
+
+async def skopeo_list_tags(repository: str, creds: Optional[str] = None) -> List[str]:
+    """List the tags of a repository."""
+    cmd = ["skopeo", "list-tags"]
+    if creds:
+        cmd.extend(["--creds", creds])
+    cmd.append(f"docker://{repository}")
+    
+    returncode, stdout = await run_capture_async(cmd)
+    if returncode != 0:
+        # The repository does not exist yet or is not readable
+        return []
+    try:
+        return json.loads(stdout).get("Tags") or []
+    except (ValueError, AttributeError):
+        # Unexpected output is treated like an unreadable repository
+        return []
+
+
+async def skopeo_inspect_digest(reference: str, creds: Optional[str] = None) -> Optional[str]:
+    """Get the digest of the manifest skopeo copy would mirror for the current platform."""
+    cmd = ["skopeo", "inspect", "--raw"]
+    if creds:
+        cmd.extend(["--creds", creds])
+    cmd.append(f"docker://{reference}")
+    
+    returncode, stdout = await run_capture_async(cmd)
+    if returncode != 0:
+        return None
+    
+    try:
+        manifest = json.loads(stdout)
+    except ValueError:
+        manifest = None
+    if not isinstance(manifest, dict):
+        # Unexpected output is treated like a failed inspect
+        return None
+    if manifest.get("mediaType") not in MANIFEST_LIST_TYPES and "manifests" not in manifest:
+        return "sha256:" + hashlib.sha256(stdout).hexdigest()
+    
+    # skopeo copy only mirrors the image matching the system platform
+    machine = platform.machine().lower()
+    architecture = OCI_ARCHITECTURES.get(machine, machine)
+    for instance in manifest.get("manifests", []):
+        instance_platform = instance.get("platform", {})
+        if instance_platform.get("os") == "linux" and instance_platform.get("architecture") == architecture:
+            return instance.get("digest")
+    return None
+
+
+async def mirror_image(source: str, destination: str, tag: str, registry_username: str, registry_password: str, retry_attempts: int, retry_delay: float, parallel_blobs: Optional[int] = None) -> bool:
+    """Mirror a single Docker image using skopeo."""
     source_full = f"{source}:{tag}"
     dest_full = f"{destination}:{tag}"
     
-    print(f"Mirroring: {source_full} → {dest_full}")
+    dest_creds = f"{registry_username}:{registry_password}"
+    
+    log(f"Mirroring: {source_full} → {dest_full}")
     
     for attempt in range(1, retry_attempts + 1):
         try:
             cmd = [
                 "skopeo", "copy",
-                "--dest-creds", f"{registry_username}:{registry_password}",
-                f"docker://{source_full}",
-                f"docker://{dest_full}"
+                "--dest-creds", dest_creds,
+                # Source blobs are already valid, copy them as-is without recompressing
+                "--preserve-digests",
             ]
+            if parallel_blobs:
+                cmd.extend(["--image-parallel-copies", str(parallel_blobs)])
+            cmd.extend([f"docker://{source_full}", f"docker://{dest_full}"])
             
-            print(f"Running: {' '.join(cmd[:3])} [credentials hidden] {' '.join(cmd[4:])}")
-            
-            # Stream output in real-time
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
+            log(f"Running: {' '.join(cmd[:3])} [credentials hidden] {' '.join(cmd[4:])}")
             
-            # Stream output line by line
-            for line in iter(process.stdout.readline, ''):
-                if line:
-                    print(line.rstrip())
-            
-            process.wait()
-            
-            if process.returncode == 0:
+            if await run_command_async(cmd) == 0:
                 return True
             else:
-                print(f"Attempt {attempt} failed for {dest_full}")
+                log(f"Attempt {attempt} failed for {dest_full}")
                 if attempt < retry_attempts:
-                    print(f"Waiting {retry_delay}s before retry...")
-                    time.sleep(retry_delay)
+                    delay = retry_backoff(retry_delay, attempt)
+                    log(f"Waiting {delay:.1f}s before retry...")
+                    await asyncio.sleep(delay)
                     
         except Exception as e:
-            print(f"Error on attempt {attempt}: {e}")
+            log(f"Error on attempt {attempt}: {e}")
             if attempt < retry_attempts:
-                time.sleep(retry_delay)
+                await asyncio.sleep(retry_backoff(retry_delay, attempt))
             
     
-    print(f"Failed to mirror {source_full} after {retry_attempts} attempts")
+    log(f"Failed to mirror {source_full} after {retry_attempts} attempts")
     return False
 
 
-def download_file(url: str, output_path: Path) -> None:
-    """Download a file from a URL."""
-    print(f"Downloading: {url}")
+def sync_destination_prefix(source: str, destination: str) -> Optional[str]:
+    """Get the skopeo sync destination for a repository, or None if sync can't produce its name."""
+    # skopeo sync names each copied image after the last path component of its source
+    registry = source.split("/", 1)[0]
+    if "/" not in source or not ("." in registry or ":" in registry or registry == "localhost"):
+        return None
+    if source.rsplit("/", 1)[-1] != destination.rsplit("/", 1)[-1]:
+        return None
+    return destination.rsplit("/", 1)[0]
+
+
+async def mirror_images_bulk(source: str, destination: str, tags: List[str], registry_username: str, registry_password: str, parallel_blobs: Optional[int] = None) -> bool:
+    """Mirror several tags of one repository with a single skopeo sync."""
+    registry, repository = source.split("/", 1)
+    dest_prefix = sync_destination_prefix(source, destination)
+    
+    log(f"Syncing {len(tags)} tags: {source} → {destination}")
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".yaml") as sync_file:
+        yaml.safe_dump({registry: {"images": {repository: tags}}}, sync_file)
+        sync_file.flush()
+        
+        cmd = [
+            "skopeo", "sync",
+            "--dest-creds", f"{registry_username}:{registry_password}",
+            "--src", "yaml",
+            "--dest", "docker",
+            "--preserve-digests",
+        ]
+        if parallel_blobs:
+            cmd.extend(["--image-parallel-copies", str(parallel_blobs)])
+        cmd.extend([sync_file.name, dest_prefix])
+        
+        log(f"Running: {' '.join(cmd[:3])} [credentials hidden] {' '.join(cmd[4:])}")
+        
+        try:
+            return await run_command_async(cmd) == 0
+        except Exception as e:
+            log(f"Error syncing {source}: {e}")
+            return False
+
+
+async def sync_repository(source: str, destination: str, tags: List[str], registry_username: str, registry_password: str, parallel_blobs: Optional[int] = None) -> List[str]:
+    """Bring the destination up to date with one skopeo sync where possible, returning the tags still to copy."""
+    dest_creds = f"{registry_username}:{registry_password}"
+    
+    # Skip tags whose destination already has the same image
+    existing_tags = await skopeo_list_tags(destination, dest_creds)
+    pending = []
+    for tag in tags:
+        if tag in existing_tags:
+            source_digest, dest_digest = await asyncio.gather(
+                skopeo_inspect_digest(f"{source}:{tag}"),
+                skopeo_inspect_digest(f"{destination}:{tag}", dest_creds)
+            )
+            if source_digest and source_digest == dest_digest:
+                log(f"Already up to date: {destination}:{tag} ({source_digest})")
+                continue
+        pending.append(tag)
+    
+    # One skopeo sync copies many tags without paying process startup and auth per tag
+    if len(pending) > 1 and sync_destination_prefix(source, destination):
+        if await mirror_images_bulk(source, destination, pending, registry_username, registry_password, parallel_blobs):
+            return []
+        
+        # skopeo pushes the tag last, so new tags that now exist were copied completely;
+        # tags that existed before may still be stale and are copied again
+        synced_tags = set(await skopeo_list_tags(destination, dest_creds))
+        pending = [tag for tag in pending if tag in existing_tags or tag not in synced_tags]
+        log(f"Sync of {source} failed, copying {len(pending)} remaining tags individually")
+    
+    return pending
+
+
+async def mirror_repository(source: str, destination: str, tags: List[str], semaphore: asyncio.Semaphore, registry_username: str, registry_password: str, retry_attempts: int, retry_delay: float, parallel_blobs: Optional[int] = None) -> int:
+    """Mirror the tags of one repository, returning the number of tags that failed."""
+    async with semaphore:
+        pending = await sync_repository(source, destination, tags, registry_username, registry_password, parallel_blobs)
+    
+    # Tags that sync didn't copy are copied individually, in parallel with other copies
+    async def copy(tag: str) -> bool:
+        async with semaphore:
+            with buffered_output():
+                return await mirror_image(source, destination, tag, registry_username, registry_password, retry_attempts, retry_delay, parallel_blobs)
+    
+    results = await asyncio.gather(*(copy(tag) for tag in pending))
+    return results.count(False)
+
+
+async def mirror_repositories(jobs: List[Tuple[str, str, List[str]]], max_parallel: int, *args: Any) -> int:
+    """Mirror repositories concurrently, returning the number of tags that failed."""
+    # A semaphore bounds the skopeo processes in flight; one event loop supervises them all
+    semaphore = asyncio.Semaphore(max_parallel)
+    
+    async def run(source: str, destination: str, tags: List[str]) -> int:
+        with buffered_output():
+            return await mirror_repository(source, destination, tags, semaphore, *args)
+    
+    results = await asyncio.gather(*(run(*job) for job in jobs), return_exceptions=True)
+    
+    failed = 0
+    for (source, _, tags), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            print(f"Error mirroring {source}: {result}")
+            failed += len(tags)
+        else:
+            failed += result
+    return failed
+
+
+def configure_http_session() -> None:
+    """Set up connection pooling and transient-error retries for the shared HTTP session."""
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+    _session.mount("https://", adapter)
+    _session.mount("http://", adapter)
+
+
+class RangeIgnoredError(IOError):
+    """The server answered a range request with the whole file."""
+
+
+def download_segment(url: str, fd: int, start: int, end: int, validator: Optional[str] = None) -> None:
+    """Download the byte range start-end of a URL into the same offsets of an open file."""
+    headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+    if validator:
+        # The server sends the whole file instead if it changed, so segments can't mix versions
+        headers["If-Range"] = validator
+    with _session.get(url, headers=headers, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise RangeIgnoredError(f"Server ignored range request for {url}")
+        
+        offset = start
+        for chunk in response.iter_content(chunk_size=COPY_BUFSIZE):
+            view = memoryview(chunk)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                offset += written
+                view = view[written:]
+    
+    if offset != end + 1:
+        raise IOError(f"Incomplete range {start}-{end} downloaded from {url}")
+
+
+def download_file_ranged(url: str, output_path: Path, total_size: int, validator: Optional[str] = None) -> None:
+    """Download a file over several connections using HTTP range requests."""
+    segment_size = -(-total_size // RANGED_DOWNLOAD_SEGMENTS)
+    segments = [
+        (start, min(start + segment_size, total_size) - 1)
+        for start in range(0, total_size, segment_size)
+    ]
+    log(f"Downloading {total_size} bytes in {len(segments)} parallel ranges")
+    
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, total_size)
+        
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            futures = [
+                executor.submit(download_segment, url, fd, start, end, validator)
+                for start, end in segments
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        os.close(fd)
+
+
+class RemoteFile(NamedTuple):
+    """What a HEAD request reports about a file to download."""
+    # URL after redirects
+    url: str
+    # Size of the file as stored, if reported
+    size: Optional[int]
+    # Whether the server accepts byte range requests
+    ranges: bool
+    # Strong ETag or Last-Modified date, identifying this version of the file for If-Range
+    validator: Optional[str]
+
+
+def probe_remote(url: str) -> Optional[RemoteFile]:
+    """Ask the server about a file with a HEAD request, or None if it doesn't answer."""
+    try:
+        head = _session.head(url, allow_redirects=True, headers={"Accept-Encoding": "identity"}, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if not head.ok:
+        return None
     
-    response = requests.get(url, stream=True)
+    size = None
+    if 'content-encoding' not in head.headers:
+        size = int(head.headers.get('content-length', 0)) or None
+    # Weak ETags can't be used with If-Range
+    validator = head.headers.get('etag')
+    if not validator or validator.startswith("W/"):
+        validator = head.headers.get('last-modified')
+    return RemoteFile(head.url, size, head.headers.get('accept-ranges') == "bytes", validator)
+
+
+def supports_ranged_download(remote: Optional[RemoteFile], threshold: int = RANGED_DOWNLOAD_THRESHOLD) -> bool:
+    """Check whether a file is larger than threshold and can be downloaded in parallel ranges."""
+    return (
+        remote is not None
+        and remote.ranges
+        and remote.size is not None
+        and remote.size > threshold
+        and hasattr(os, "pwrite")
+    )
+
+
+def download_file(url: str, output_path: Path, remote: Optional[RemoteFile] = None) -> None:
+    """Download a file from a URL, using what a previous HEAD request reported about it."""
+    log(f"Downloading: {url}")
+    
+    # Large files are fetched in parallel ranges when the server allows it
+    if supports_ranged_download(remote):
+        try:
+            download_file_ranged(remote.url, output_path, remote.size, remote.validator)
+            log(f"Downloaded to: {output_path}")
+            return
+        except RangeIgnoredError as e:
+            # The file changed since the HEAD request, or ranges aren't served after all
+            log(f"{e}, downloading it in one piece")
+    
+    response = _session.get(url, stream=True, timeout=HTTP_TIMEOUT)
     response.raise_for_status()
     
-    total_size = int(response.headers.get('content-length', 0))
-    downloaded = 0
+    # Content-Length is the encoded size when the server compresses the response
+    total_size = 0
+    if 'content-encoding' not in response.headers:
+        total_size = int(response.headers.get('content-length', 0))
     
     with open(output_path, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
+        advise_sequential(f.fileno())
+        # Reserve the space up front, so the filesystem doesn't grow the file extent by extent
+        if total_size and hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(f.fileno(), 0, total_size)
+        for chunk in response.iter_content(chunk_size=COPY_BUFSIZE):
             if chunk:
                 f.write(chunk)
+        # Don't keep preallocated bytes the server never sent
+        f.truncate()
     
-    print(f"\nDownloaded to: {output_path}")
+    log(f"\nDownloaded to: {output_path}")
 
 
-def apply_transforms(file_path: Path, transforms: List[Dict[str, Any]]) -> Path:
-    """Apply a list of transforms to a file."""
-    current_path = file_path
+def download_and_transform(url: str, output_path: Path, transformers: List[Tuple[str, StreamTransformer]]) -> Path:
+    """Download a file and apply streaming transforms in a single pass."""
+    log(f"Downloading: {url}")
     
-    for transform in transforms:
-        transform_type = transform.get("type")
+    with ExitStack() as stack:
+        response = stack.enter_context(_session.get(url, stream=True, timeout=HTTP_TIMEOUT))
+        response.raise_for_status()
         
-        if transform_type not in TRANSFORMERS:
-            raise ValueError(f"Unknown transformer type: {transform_type}")
+        # Undo any Content-Encoding, as iter_content would
+        response.raw.decode_content = True
+        stream = response.raw
+        for name, transformer in transformers:
+            log(f"Applying transform: {name} (streaming)")
+            stream, output_path = transformer(stream, output_path)
+            stack.enter_context(stream)
         
-        print(f"Applying transform: {transform_type}")
-        transformer = TRANSFORMERS[transform_type]
-        current_path = transformer(current_path)
+        with open(output_path, 'wb') as f:
+            advise_sequential(f.fileno())
+            shutil.copyfileobj(stream, f, COPY_BUFSIZE)
     
-    return current_path
+    log(f"Downloaded to: {output_path}")
+    return output_path
+
+
+def file_fingerprint(path: Path) -> Tuple[int, int]:
+    """Get the size and modification time of a file, to detect changes without reading it."""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def fetch_artifact(source: str, transforms: CompiledTransforms, workdir: Path, remote: Optional[RemoteFile]) -> Path:
+    """Download a file into workdir and apply its transforms, given what probe_remote() reported about it."""
+    # Extract filename from URL
+    filename = source.rsplit("/", 1)[-1]
+    download_path = workdir / filename
+    
+    if not transforms.stream:
+        # Download file
+        download_file(source, download_path, remote)
+        return transforms.apply_all(download_path)
+    
+    # Large files are faster to fetch over parallel ranges and decompress with the
+    # file transformers (rapidgzip) than in a single streaming pass
+    if supports_ranged_download(remote, max(RANGED_DOWNLOAD_THRESHOLD, PARALLEL_GUNZIP_THRESHOLD)):
+        download_file(source, download_path, remote)
+        return transforms.apply_all(download_path)
+    
+    # Transform while downloading, so the intermediate files never hit the disk. The
+    # final file itself is needed: oras push digests a file before uploading it and
+    # then reads it again, so it can't consume a FIFO or stdin.
+    download_path = download_and_transform(source, download_path, transforms.stream)
+    
+    # Apply the remaining transforms
+    return transforms.apply(download_path)
+
+
+def tmpfs_free_space() -> int:
+    """Bytes that can be written to tmpfs without exceeding its size limit or free memory."""
+    free = shutil.disk_usage(TMPFS_DIR).free
+    try:
+        free = min(free, os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, ValueError, OSError):
+        pass
+    return free
+
+
+class ArtifactCache:
+    """Processed files shared by retries and by file mirrors with the same source and transforms."""
+    
+    def __init__(self, users: Optional[Dict[Tuple[str, str], int]] = None):
+        # Mirrors using each (source, transforms key); an artifact is removed once all released it
+        self._users = dict(users or {})
+        self._tmpdir = tempfile.TemporaryDirectory()
+        # Files that fit in memory are fetched to tmpfs, which avoids disk I/O entirely
+        self._tmpfs_tmpdir = None
+        if os.path.isdir(TMPFS_DIR):
+            try:
+                self._tmpfs_tmpdir = tempfile.TemporaryDirectory(dir=TMPFS_DIR)
+            except OSError:
+                pass
+        self._tmpfs_reserved = 0
+        # Sources whose processed files outgrew the tmpfs estimate
+        self._tmpfs_misfits: Set[str] = set()
+        # Processed file, its workdir, and its size and mtime when fetched
+        self._entries: Dict[Tuple[str, str], Tuple[Path, Path, Tuple[int, int]]] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    def release(self, source: str, transforms: CompiledTransforms) -> None:
+        """Mark one user of an artifact as done, removing its files after the last one."""
+        key = (source, transforms.key)
+        with self._lock:
+            remaining = self._users.get(key, 1) - 1
+            self._users[key] = remaining
+            if remaining > 0:
+                return
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            shutil.rmtree(entry[1], ignore_errors=True)
+    
+    def close(self) -> None:
+        """Remove all cached files."""
+        self._tmpdir.cleanup()
+        if self._tmpfs_tmpdir is not None:
+            self._tmpfs_tmpdir.cleanup()
+    
+    def _create_workdir(self, source: str, remote: Optional[RemoteFile]) -> Tuple[Path, int]:
+        """Create a directory to fetch source into, returning it and the tmpfs space it reserved."""
+        if self._tmpfs_tmpdir is not None and source not in self._tmpfs_misfits:
+            if remote is not None and remote.size:
+                needed = remote.size * TMPFS_SPACE_FACTOR
+                # Space is reserved until the fetch ends, so parallel fetches can't overcommit tmpfs
+                with self._lock:
+                    if tmpfs_free_space() - self._tmpfs_reserved > needed:
+                        self._tmpfs_reserved += needed
+                        return Path(tempfile.mkdtemp(dir=self._tmpfs_tmpdir.name)), needed
+        return Path(tempfile.mkdtemp(dir=self._tmpdir.name)), 0
+    
+    def get(self, source: str, transforms: CompiledTransforms) -> Path:
+        """Return the processed file for source and transforms, fetching it if needed."""
+        key = (source, transforms.key)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        # Concurrent requests for the same artifact wait for a single fetch
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                path, workdir, fingerprint = entry
+                # Size and mtime catch a changed file without reading it again
+                if path.exists() and file_fingerprint(path) == fingerprint:
+                    log(f"Reusing cached file: {path}")
+                    return path
+                log(f"Cached file {path} changed on disk, fetching again")
+                shutil.rmtree(workdir, ignore_errors=True)
+                del self._entries[key]
+            
+            # One HEAD request serves both the tmpfs decision and the download
+            remote = probe_remote(source)
+            while True:
+                workdir, reserved = self._create_workdir(source, remote)
+                try:
+                    path = fetch_artifact(source, transforms, workdir, remote)
+                    break
+                except OSError as e:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                    if not reserved or e.errno != errno.ENOSPC:
+                        raise
+                    # Transforms can expand a file well beyond the estimate, so it goes to disk
+                    log(f"{source} does not fit in {TMPFS_DIR}, fetching it to disk")
+                    with self._lock:
+                        self._tmpfs_misfits.add(source)
+                except Exception:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                    raise
+                finally:
+                    with self._lock:
+                        self._tmpfs_reserved -= reserved
+            self._entries[key] = (path, workdir, file_fingerprint(path))
+            return path
+
 
 def oras_login(registry_username: str, registry_password: str) -> bool:
     """Login to OCI registry using oras."""
@@ -171,14 +871,7 @@ def oras_login(registry_username: str, registry_password: str) -> bool:
 
     print("Running oras login")
     
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
-    
-    for line in iter(process.stdout.readline, ''):
-        print(line.rstrip())
-        
-    process.wait()
-    
-    if process.returncode == 0:
+    if run_command(cmd) == 0:
         return True
     else:
         print(f"Failed to login to OCI registry")
@@ -188,18 +881,15 @@ def push_file_to_registry(
     file_path: Path,
     destination: str,
     tags: List[str],
-    registry_owner: str,
     registry_username: str,
     registry_password: str,
     mime_type: Optional[str] = None
 ) -> bool:
     """Push a file to OCI registry using oras with multiple tags."""
-    # Replace template variables
-    destination = destination.replace("{{GITHUB_REPOSITORY_OWNER}}", registry_owner)
     tags_str = ",".join(tags)
     dest_full = f"{destination}:{tags_str}"
     
-    print(f"Pushing file to: {destination} with tags: {tags_str}")
+    log(f"Pushing file to: {destination} with tags: {tags_str}")
     
     try:
         cmd = [
@@ -214,35 +904,17 @@ def push_file_to_registry(
             # Set custom media type
             cmd.extend(["--artifact-type", mime_type])
         
-        print(f"Running: {' '.join(cmd)}")
+        log(f"Running: {' '.join(cmd)}")
         
-        # Stream output in real-time
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-        
-        # Stream output line by line
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                print(line.rstrip())
-        
-        process.wait()
-        
-        if process.returncode == 0:
-            print(f"Successfully pushed: {dest_full}")
+        if run_command(cmd) == 0:
+            log(f"Successfully pushed: {dest_full}")
             return True
         else:
-            print(f"Failed to push {dest_full}")
+            log(f"Failed to push {dest_full}")
             return False
             
     except Exception as e:
-        print(f"Error pushing file: {e}")
+        log(f"Error pushing file: {e}")
         return False
 
 
@@ -250,38 +922,32 @@ def mirror_file(
     source: str,
     destination: str,
     tags: List[str],
-    transforms: List[Dict[str, Any]],
-    registry_owner: str,
+    transforms: CompiledTransforms,
     registry_username: str,
     registry_password: str,
     mime_type: Optional[str] = None,
     retry_attempts: int = 3,
-    retry_delay: int = 1
+    retry_delay: float = 1,
+    cache: Optional[ArtifactCache] = None
 ) -> bool:
     """Download, transform, and push a file to OCI registry with multiple tags."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Extract filename from URL
-        filename = source.split("/")[-1]
-        download_path = tmpdir_path / filename
+    with ExitStack() as stack:
+        if cache is None:
+            cache = ArtifactCache()
+            stack.callback(cache.close)
+        # The processed file is removed once every mirror using it is done
+        stack.callback(cache.release, source, transforms)
         
         for attempt in range(1, retry_attempts + 1):
             try:
-                # Download file
-                download_file(source, download_path)
-                
-                # Apply transforms
-                processed_path = download_path
-                if transforms:
-                    processed_path = apply_transforms(download_path, transforms)
+                # A retry after a failed push reuses the already processed file
+                processed_path = cache.get(source, transforms)
                 
                 # Push to registry with all tags
                 if push_file_to_registry(
                     processed_path,
                     destination,
                     tags,
-                    registry_owner,
                     registry_username,
                     registry_password,
                     mime_type
@@ -289,18 +955,127 @@ def mirror_file(
                     return True
                 else:
                     if attempt < retry_attempts:
-                        print(f"Waiting {retry_delay}s before retry...")
-                        time.sleep(retry_delay)
+                        delay = retry_backoff(retry_delay, attempt)
+                        log(f"Waiting {delay:.1f}s before retry...")
+                        time.sleep(delay)
                         
             except Exception as e:
-                print(f"Error on attempt {attempt}: {e}")
+                log(f"Error on attempt {attempt}: {e}")
                 if attempt < retry_attempts:
-                    time.sleep(retry_delay)
+                    time.sleep(retry_backoff(retry_delay, attempt))
         
-        print(f"Failed to mirror {source} after {retry_attempts} attempts")
+        log(f"Failed to mirror {source} after {retry_attempts} attempts")
         return False
 
 
+class DockerMirror(NamedTuple):
+    """A Docker repository to mirror, with its destination resolved."""
+    source: str
+    destination: str
+    tags: List[str]
+
+
+class FileMirror(NamedTuple):
+    """A file to mirror, with its destination resolved and transforms compiled."""
+    source: str
+    destination: str
+    tags: List[str]
+    transforms: CompiledTransforms
+    mime_type: Optional[str]
+
+
+class CompiledConfig(NamedTuple):
+    """A validated configuration, ready to run without further lookups."""
+    docker: List[DockerMirror]
+    files: List[FileMirror]
+    retry_attempts: int
+    retry_delay: float
+    max_parallel_copies: int
+    max_parallel_pushes: int
+    parallel_blobs: Optional[int]
+
+
+def config_section(config: Dict[str, Any], section: str) -> List[Dict[str, Any]]:
+    """Get a list of mirror entries from the configuration, checking each is a mapping."""
+    entries = config.get(section) or []
+    if not isinstance(entries, list):
+        raise ValueError(f"'{section}' must be a list")
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{section}[{i}]: must be a mapping with 'source' and 'destination', got: {entry!r}")
+    return entries
+
+
+def is_number(value: Any) -> bool:
+    """Check whether a setting is an int or float; YAML booleans are ints in Python."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def resolve_mirror_entry(section: str, index: int, entry: Dict[str, Any], registry_owner: str) -> Tuple[str, str, List[str]]:
+    """Validate the fields shared by all mirror entries and resolve the destination template."""
+    for field in ("source", "destination"):
+        if not isinstance(entry.get(field), str):
+            raise ValueError(f"{section}[{index}]: '{field}' must be a string")
+    tags = entry.get("tags") or []
+    if not isinstance(tags, list):
+        raise ValueError(f"{section}[{index}]: 'tags' must be a list")
+    for tag in tags:
+        if isinstance(tag, float):
+            # An unquoted 3.10 is parsed as 3.1 and would be mirrored under the wrong tag
+            raise ValueError(f"{section}[{index}]: tag {tag!r} was parsed as a number, quote the tag")
+        if not isinstance(tag, (str, int)) or isinstance(tag, bool):
+            raise ValueError(f"{section}[{index}]: tags must be strings, got: {tag!r}")
+    
+    # Replace template variables
+    destination = entry["destination"].replace("{{GITHUB_REPOSITORY_OWNER}}", registry_owner)
+    return entry["source"], destination, [str(tag) for tag in tags]
+
+
+def validate_and_compile_config(config: Dict[str, Any], registry_owner: str) -> CompiledConfig:
+    """Validate the configuration and resolve it once, so errors surface before any network I/O."""
+    if not isinstance(config, dict):
+        raise ValueError("the configuration must be a mapping")
+    
+    docker = []
+    for i, entry in enumerate(config_section(config, "docker")):
+        docker.append(DockerMirror(*resolve_mirror_entry("docker", i, entry, registry_owner)))
+    
+    files = []
+    for i, entry in enumerate(config_section(config, "files")):
+        source, destination, tags = resolve_mirror_entry("files", i, entry, registry_owner)
+        try:
+            transforms = compile_transforms(entry.get("transforms") or [])
+        except ValueError as e:
+            raise ValueError(f"files[{i}]: {e}")
+        mime_type = entry.get("mime")
+        if mime_type is not None and not isinstance(mime_type, str):
+            raise ValueError(f"files[{i}]: 'mime' must be a string")
+        files.append(FileMirror(source, destination, tags, transforms, mime_type))
+    
+    settings = config.get("settings") or {}
+    if not isinstance(settings, dict):
+        raise ValueError("'settings' must be a mapping")
+    compiled = CompiledConfig(
+        docker=docker,
+        files=files,
+        retry_attempts=settings.get("retry_attempts", 3),
+        retry_delay=settings.get("retry_delay", 1),
+        max_parallel_copies=settings.get("max_parallel_copies", 8),
+        max_parallel_pushes=settings.get("max_parallel_pushes", 4),
+        parallel_blobs=settings.get("parallel_blobs")
+    )
+    positive_integers = ["retry_attempts", "max_parallel_copies", "max_parallel_pushes"]
+    if compiled.parallel_blobs is not None:
+        positive_integers.append("parallel_blobs")
+    for name in positive_integers:
+        value = getattr(compiled, name)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f"settings.{name} must be a positive integer, got: {value!r}")
+    if not is_number(compiled.retry_delay) or compiled.retry_delay < 0:
+        raise ValueError(f"settings.retry_delay must be a non-negative number, got: {compiled.retry_delay!r}")
+    return compiled
+
+
 def main():
     """Main function to mirror Docker images and files."""
     config_file = "mirror-config.yaml"
@@ -312,19 +1087,6 @@ def main():
     # Load configuration
     config = load_config(config_file)
     
-    # Determine which tools are needed
-    required_tools = []
-    if config.get("docker"):
-        required_tools.append("skopeo")
-    if config.get("files"):
-        required_tools.append("oras")
-    
-    # Verify required tools are available
-    print("Checking required tools...")
-    verify_required_tools(required_tools)
-    print(f"All required tools available: {', '.join(required_tools)}")
-    print()
-    
     # Get registry owner (namespace) and auth credentials
     registry_owner = os.getenv("GITHUB_TARGET_REPO_OWNER") or os.getenv("GITHUB_REPOSITORY_OWNER") or os.getenv("GITHUB_ACTOR")
     registry_username = os.getenv("GITHUB_USERNAME") or os.getenv("GITHUB_ACTOR")
@@ -338,88 +1100,102 @@ def main():
         print("GITHUB_TARGET_REPO_OWNER/GITHUB_REPOSITORY_OWNER, GITHUB_USERNAME/GITHUB_ACTOR and GITHUB_TOKEN are required")
         sys.exit(1)
     
-    # Get global settings
-    retry_attempts = config.get("settings", {}).get("retry_attempts", 3)
-    retry_delay = config.get("settings", {}).get("retry_delay", 1)
+    # Validate the whole configuration before doing any work
+    try:
+        config = validate_and_compile_config(config, registry_owner)
+    except ValueError as e:
+        print(f"Invalid configuration in {config_file}: {e}")
+        sys.exit(1)
+    
+    # Determine which tools are needed
+    required_tools = []
+    if config.docker:
+        required_tools.append("skopeo")
+    if config.files:
+        required_tools.append("oras")
+    
+    # Verify required tools are available
+    print("Checking required tools...")
+    verify_required_tools(required_tools)
+    print(f"All required tools available: {', '.join(required_tools)}")
+    print()
     
     print(f"Global settings:")
-    print(f"  - Retry attempts: {retry_attempts}")
-    print(f"  - Retry delay: {retry_delay}s")
+    print(f"  - Retry attempts: {config.retry_attempts}")
+    print(f"  - Retry delay: {config.retry_delay}s")
+    print(f"  - Max parallel copies: {config.max_parallel_copies}")
+    print(f"  - Max parallel pushes: {config.max_parallel_pushes}")
+    if config.parallel_blobs:
+        print(f"  - Parallel blob copies per image: {config.parallel_blobs}")
     print()
     
     failed_mirrors = 0
     
     # Process Docker images
-    docker_mirrors = config.get("docker", [])
-    if docker_mirrors:
-        print(f"Found {len(docker_mirrors)} Docker image configurations to process")
+    if config.docker:
+        print(f"Found {len(config.docker)} Docker image configurations to process")
         print()
         
-        for i, mirror in enumerate(docker_mirrors):
-            print(f"Processing Docker configuration {i + 1}/{len(docker_mirrors)}")
+        for i, mirror in enumerate(config.docker):
+            print(f"Processing Docker configuration {i + 1}/{len(config.docker)}")
+            print(f"  Source: {mirror.source}")
+            print(f"  Destination: {mirror.destination}")
+            print(f"  Tags to mirror: {len(mirror.tags)}")
             
-            source = mirror.get("source")
-            destination = mirror.get("destination")
-            tags = mirror.get("tags", [])
-            
-            print(f"  Source: {source}")
-            print(f"  Destination: {destination}")
-            print(f"  Tags to mirror: {len(tags)}")
-            
-            for tag in tags:
+            for tag in mirror.tags:
                 print(f"    - {tag}")
-                
-                if not mirror_image(source, destination, tag, registry_owner, registry_username, registry_password, retry_attempts, retry_delay):
-                    failed_mirrors += 1
             
             print()
+        
+        print(f"Mirroring {len(config.docker)} repositories with up to {config.max_parallel_copies} skopeo operations in parallel")
+        print()
+        
+        failed_mirrors += asyncio.run(mirror_repositories(config.docker, config.max_parallel_copies, registry_username, registry_password, config.retry_attempts, config.retry_delay, config.parallel_blobs))
     
     # Process files
-    file_mirrors = config.get("files", [])
-    if file_mirrors:
-        print(f"Found {len(file_mirrors)} file configurations to process")
+    if config.files:
+        print(f"Found {len(config.files)} file configurations to process")
         print()
+        
+        configure_http_session()
 
         if not oras_login(registry_username, registry_password):
             print("Failed to login to OCI registry")
             sys.exit(1)
         
-        for i, file_config in enumerate(file_mirrors):
-            print(f"Processing file configuration {i + 1}/{len(file_mirrors)}")
-            
-            source = file_config.get("source")
-            destination = file_config.get("destination")
-            tags = file_config.get("tags", [])
-            transforms = file_config.get("transforms", [])
-            mime_type = file_config.get("mime")
-            
-            print(f"  Source: {source}")
-            print(f"  Destination: {destination}")
-            print(f"  Tags to process: {len(tags)}")
-            if transforms:
-                print(f"  Transforms: {[t.get('type') for t in transforms]}")
-            if mime_type:
-                print(f"  MIME type: {mime_type}")
+        # Processed files are shared by the file configurations that use them, keyed on source
+        # and transforms, and removed once the last of them is pushed
+        cache = ArtifactCache(Counter((file_mirror.source, file_mirror.transforms.key) for file_mirror in config.files))
+        
+        for i, file_mirror in enumerate(config.files):
+            print(f"Processing file configuration {i + 1}/{len(config.files)}")
+            print(f"  Source: {file_mirror.source}")
+            print(f"  Destination: {file_mirror.destination}")
+            print(f"  Tags to process: {len(file_mirror.tags)}")
+            if file_mirror.transforms.names:
+                print(f"  Transforms: {file_mirror.transforms.names}")
+            if file_mirror.mime_type:
+                print(f"  MIME type: {file_mirror.mime_type}")
             
-            for tag in tags:
+            for tag in file_mirror.tags:
                 print(f"    - {tag}")
             
-            # Process all tags for this file configuration at once
-            if not mirror_file(
-                source,
-                destination,
-                tags,
-                transforms,
-                registry_owner,
-                registry_username,
-                registry_password,
-                mime_type,
-                retry_attempts,
-                retry_delay
-            ):
-                failed_mirrors += 1
-            
             print()
+        
+        print(f"Mirroring {len(config.files)} files with up to {config.max_parallel_pushes} parallel pushes")
+        print()
+        
+        # All tags of a file configuration are pushed at once
+        with ThreadPoolExecutor(max_workers=config.max_parallel_pushes) as executor:
+            futures = [
+                executor.submit(run_buffered, mirror_file, file_mirror.source, file_mirror.destination, file_mirror.tags, file_mirror.transforms, registry_username, registry_password, file_mirror.mime_type, config.retry_attempts, config.retry_delay, cache)
+                for file_mirror in config.files
+            ]
+            for future in as_completed(futures):
+                if not future.result():
+                    failed_mirrors += 1
+        
+        cache.close()
     
     if failed_mirrors > 0:
         print(f"Failed mirrors: {failed_mirrors}")